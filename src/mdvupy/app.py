@@ -16,14 +16,14 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 from PySide6.QtGui import QAction, QDesktopServices, QKeySequence, QTextDocument
-from PySide6.QtCore import Qt, QUrl, QEvent
+from PySide6.QtCore import Qt, QUrl, QEvent, QSettings
 import qdarktheme
 
 from .history import FileHistory
-from .loader import load_markdown_file
+from .loader import available_backends, load_markdown_file, set_backend
 from .search import SearchWidget
 from .toc import extract_toc
-from .view import MarkdownView
+from .view import MarkdownView, RenderMode
 from loguru import logger
 
 class MainWindow(QMainWindow):
@@ -35,6 +35,11 @@ class MainWindow(QMainWindow):
 		qdarktheme.setup_theme("light")
 
 		self._current_text = ""  # Store current markdown text for search/TOC
+		self._current_path: Path | None = None
+		self._settings = QSettings("mdvupy", "mdvupy")
+		backend = self._settings.value("loader/backend")
+		if backend in available_backends():
+			set_backend(backend)  # Chosen by `python -m mdvupy.benchmark`
 		self._history = FileHistory(max_size=20)
 		self._loading_from_history = False  # Flag to prevent adding to history during navigation
 		
@@ -51,6 +56,10 @@ class MainWindow(QMainWindow):
 		"""Set up the main UI components."""
 		# Main view
 		self._view = MarkdownView(self)
+		render_mode = self._settings.value("view/render_mode", RenderMode.HTML.value)
+		if render_mode in {mode.value for mode in RenderMode}:
+			self._view.set_render_mode(RenderMode(render_mode))
+		self._view.verify_parity = self._settings.value("view/verify_render_parity", False, type=bool)
 		self.setCentralWidget(self._view)
 
 		# Wire link signals from MarkdownView
@@ -109,6 +118,11 @@ class MainWindow(QMainWindow):
 		self._action_toggle_toc.setCheckable(True)
 		self._action_toggle_toc.triggered.connect(self._toggle_toc)
 
+		self._action_direct_render = QAction("Direct Rendering", self)
+		self._action_direct_render.setCheckable(True)
+		self._action_direct_render.setChecked(self._view.render_mode is RenderMode.DOCUMENT)
+		self._action_direct_render.toggled.connect(self._toggle_direct_render)
+
 		self._action_search = QAction("Search…", self)
 		self._action_search.setShortcut(QKeySequence.StandardKey.Find)
 		self._action_search.triggered.connect(self._show_search)
@@ -141,6 +155,7 @@ class MainWindow(QMainWindow):
 		view_menu = self.menuBar().addMenu("View")
 		view_menu.addAction(self._action_toggle_toc)
 		view_menu.addAction(self._action_search)
+		view_menu.addAction(self._action_direct_render)
 		view_menu.addSeparator()
 		view_menu.addAction(self._action_zoom_in)
 		view_menu.addAction(self._action_zoom_out)
@@ -182,6 +197,7 @@ class MainWindow(QMainWindow):
 			return
 
 		self._current_text = text
+		self._current_path = path
 		logger.info(f"Setting markdown in view with base_path: {path.parent}")
 		self._view.set_markdown(text, base_path=path.parent)
 		self.setWindowTitle(f"mdvupy — {path.name}")
@@ -248,6 +264,14 @@ class MainWindow(QMainWindow):
 		else:
 			self._toc_dock.show()
 
+	def _toggle_direct_render(self, checked: bool) -> None:
+		"""Switch between the HTML and direct QTextDocument renderers."""
+		mode = RenderMode.DOCUMENT if checked else RenderMode.HTML
+		self._settings.setValue("view/render_mode", mode.value)
+		self._view.set_render_mode(mode)
+		if self._current_path is not None:
+			self._view.set_markdown(self._current_text, base_path=self._current_path.parent)
+
 	def _show_search(self) -> None:
 		"""Show search widget and focus input."""
 		self._search_widget.show()
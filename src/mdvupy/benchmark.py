@@ -0,0 +1,57 @@
+"""Pick the fastest Markdown backend on this machine.
+
+Usage: python -m mdvupy.benchmark FILE [FILE ...]
+
+Each available backend renders and extracts the TOC of the given documents;
+backends whose output, TOC, link targets or source map differ from markdown-it
+are skipped. The fastest conforming backend is saved and used by the viewer on
+next launch.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+from PySide6.QtCore import QSettings
+
+from .loader import available_backends, backend_mismatches, load_markdown_file
+
+_REPEATS = 5
+
+
+def main(argv: list[str] | None = None) -> int:
+	paths = [Path(arg) for arg in (sys.argv[1:] if argv is None else argv)]
+	if not paths:
+		print(__doc__.strip().splitlines()[2])
+		return 2
+
+	texts = [load_markdown_file(path) for path in paths]
+	nonconforming: dict[str, set[str]] = {}
+	for text in texts:
+		for name, aspect in backend_mismatches(text):
+			nonconforming.setdefault(name, set()).add(aspect)
+
+	timings: dict[str, float] = {}
+	for name, backend in available_backends().items():
+		start = time.perf_counter()
+		for _ in range(_REPEATS):
+			for text in texts:
+				backend.render(text)
+				backend.headings(text)
+		timings[name] = (time.perf_counter() - start) / _REPEATS
+		status = ""
+		if name in nonconforming:
+			status = f"  ({', '.join(sorted(nonconforming[name]))} differ, skipped)"
+		print(f"{name:12} {timings[name] * 1000:9.2f} ms{status}")
+
+	candidates = {name: elapsed for name, elapsed in timings.items() if name not in nonconforming}
+	fastest = min(candidates, key=candidates.__getitem__)
+	QSettings("mdvupy", "mdvupy").setValue("loader/backend", fastest)
+	print(f"Using {fastest}")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
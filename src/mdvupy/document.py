@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+from functools import cache
+
+from markdown_it.token import Token
+from PySide6.QtGui import (
+	QColor,
+	QFont,
+	QTextBlockFormat,
+	QTextCharFormat,
+	QTextCursor,
+	QTextDocument,
+	QTextFormat,
+	QTextImageFormat,
+	QTextLength,
+	QTextList,
+	QTextListFormat,
+	QTextTableFormat,
+)
+
+from .loader import md
+from .toc import make_anchor
+
+# Relative font sizes used by Qt's own HTML importer for <h1>..<h6>
+_HEADING_SIZE_ADJUSTMENT = {1: 3, 2: 2, 3: 1, 4: 0, 5: -1, 6: -2}
+_MONOSPACE_FAMILIES = ["SF Mono", "Consolas", "monospace"]
+_LINK_COLOR = "#4f8cff"
+_DOCUMENT_MARGIN = 24
+_BULLET_STYLES = (QTextListFormat.Style.ListDisc, QTextListFormat.Style.ListCircle, QTextListFormat.Style.ListSquare)
+
+
+@cache
+def _heading_block_format(level: int) -> QTextBlockFormat:
+	fmt = QTextBlockFormat()
+	fmt.setHeadingLevel(level)
+	fmt.setTopMargin(18)
+	fmt.setBottomMargin(8)
+	return fmt
+
+
+@cache
+def _heading_char_format(level: int) -> QTextCharFormat:
+	fmt = QTextCharFormat()
+	fmt.setFontWeight(QFont.Weight.DemiBold)
+	fmt.setProperty(QTextFormat.Property.FontSizeAdjustment, _HEADING_SIZE_ADJUSTMENT[level])
+	return fmt
+
+
+@cache
+def _paragraph_block_format(tight: bool) -> QTextBlockFormat:
+	fmt = QTextBlockFormat()
+	if not tight:
+		fmt.setTopMargin(6)
+		fmt.setBottomMargin(6)
+	return fmt
+
+
+@cache
+def _code_block_format() -> QTextBlockFormat:
+	fmt = QTextBlockFormat()
+	fmt.setNonBreakableLines(True)
+	fmt.setLeftMargin(12)
+	fmt.setRightMargin(12)
+	return fmt
+
+
+@cache
+def _rule_block_format() -> QTextBlockFormat:
+	fmt = QTextBlockFormat()
+	fmt.setProperty(
+		QTextFormat.Property.BlockTrailingHorizontalRulerWidth,
+		QTextLength(QTextLength.Type.PercentageLength, 100),
+	)
+	return fmt
+
+
+@cache
+def _code_char_format() -> QTextCharFormat:
+	fmt = QTextCharFormat()
+	fmt.setFontFamilies(_MONOSPACE_FAMILIES)
+	fmt.setFontFixedPitch(True)
+	return fmt
+
+
+@cache
+def _link_char_format() -> QTextCharFormat:
+	fmt = QTextCharFormat()
+	fmt.setAnchor(True)
+	fmt.setForeground(QColor(_LINK_COLOR))
+	fmt.setFontUnderline(False)
+	return fmt
+
+
+@cache
+def _inline_char_format(token_type: str) -> QTextCharFormat:
+	fmt = QTextCharFormat()
+	if token_type == "em_open":
+		fmt.setFontItalic(True)
+	elif token_type == "strong_open":
+		fmt.setFontWeight(QFont.Weight.Bold)
+	elif token_type == "s_open":
+		fmt.setFontStrikeOut(True)
+	return fmt
+
+
+@cache
+def _table_format() -> QTextTableFormat:
+	fmt = QTextTableFormat()
+	fmt.setBorder(1)
+	fmt.setBorderStyle(QTextTableFormat.BorderStyle.BorderStyle_Solid)
+	fmt.setCellSpacing(0)
+	fmt.setCellPadding(4)
+	fmt.setHeaderRowCount(1)
+	return fmt
+
+
+def _merged(base: QTextCharFormat, overlay: QTextCharFormat) -> QTextCharFormat:
+	fmt = QTextCharFormat(base)
+	fmt.merge(overlay)
+	return fmt
+
+
+class DocumentBuilder:
+	"""Builds a QTextDocument directly from markdown-it tokens.
+
+	This bypasses the HTML round-trip of render_markdown_to_html/setHtml:
+	blocks and fragments are inserted through a QTextCursor using cached
+	formats for each element type.
+	"""
+
+	def __init__(self, document: QTextDocument) -> None:
+		self._document = document
+		self._cursor = QTextCursor(document)
+		self._reuse_block = True  # The first block of an empty document is reused
+		self._quote_depth = 0
+		self._lists: list[QTextListFormat] = []
+		self._text_lists: list[QTextList | None] = []  # Created lazily by the first item of each list
+		self._pending_item = False  # A list item is open but has no block yet
+		self._chars: list[QTextCharFormat] = [QTextCharFormat()]
+
+	def build(self, tokens: list[Token]) -> QTextDocument:
+		undo_enabled = self._document.isUndoRedoEnabled()
+		self._document.setUndoRedoEnabled(False)
+		self._document.clear()
+		self._document.setDocumentMargin(_DOCUMENT_MARGIN)
+		self._cursor = QTextCursor(self._document)
+		self._cursor.beginEditBlock()
+		try:
+			self._render_blocks(tokens)
+		finally:
+			self._cursor.endEditBlock()
+			self._document.setUndoRedoEnabled(undo_enabled)
+		return self._document
+
+	def _render_blocks(self, tokens: list[Token]) -> None:
+		i = 0
+		while i < len(tokens):
+			token = tokens[i]
+			kind = token.type
+
+			if kind == "heading_open":
+				level = int(token.tag[1])
+				self._new_block(_heading_block_format(level))
+				inline = tokens[i + 1]
+				heading_fmt = QTextCharFormat(_heading_char_format(level))
+				heading_fmt.setAnchor(True)
+				heading_fmt.setAnchorNames([make_anchor(inline.content)])
+				self._chars.append(heading_fmt)
+				self._render_inline(inline.children or [])
+				self._chars.pop()
+				i += 2
+			elif kind == "paragraph_open":
+				self._new_block(_paragraph_block_format(token.hidden))
+			elif kind == "inline":
+				self._render_inline(token.children or [])
+			elif kind in ("fence", "code_block"):
+				self._render_code(token.content)
+			elif kind == "hr":
+				self._new_block(_rule_block_format())
+			elif kind == "blockquote_open":
+				self._quote_depth += 1
+			elif kind == "blockquote_close":
+				self._quote_depth -= 1
+			elif kind in ("bullet_list_open", "ordered_list_open"):
+				if self._pending_item:
+					# Nested list as the first content of an item: give the outer item its own block
+					self._new_block(_paragraph_block_format(True))
+				self._lists.append(self._list_format(token))
+				self._text_lists.append(None)
+			elif kind in ("bullet_list_close", "ordered_list_close"):
+				self._lists.pop()
+				self._text_lists.pop()
+			elif kind == "list_item_open":
+				self._pending_item = True
+			elif kind == "list_item_close":
+				if self._pending_item:
+					self._new_block(_paragraph_block_format(True))
+			elif kind == "table_open":
+				i = self._render_table(tokens, i)
+
+			i += 1
+
+	def _render_inline(self, children: list[Token]) -> None:
+		for child in children:
+			kind = child.type
+			if kind == "text":
+				self._cursor.insertText(child.content, self._chars[-1])
+			elif kind == "softbreak":
+				self._cursor.insertText(" ", self._chars[-1])
+			elif kind == "hardbreak":
+				self._cursor.insertText("\u2028", self._chars[-1])
+			elif kind == "code_inline":
+				self._cursor.insertText(child.content, _merged(self._chars[-1], _code_char_format()))
+			elif kind in ("em_open", "strong_open", "s_open"):
+				self._chars.append(_merged(self._chars[-1], _inline_char_format(kind)))
+			elif kind == "link_open":
+				fmt = _merged(self._chars[-1], _link_char_format())
+				fmt.setAnchorHref(str(child.attrGet("href") or ""))
+				self._chars.append(fmt)
+			elif kind in ("em_close", "strong_close", "s_close", "link_close"):
+				self._chars.pop()
+			elif kind == "image":
+				image = QTextImageFormat()
+				image.setName(str(child.attrGet("src") or ""))
+				self._cursor.insertImage(image)
+
+	def _render_code(self, content: str) -> None:
+		lines = content.removesuffix("\n").split("\n")
+		char_fmt = _merged(self._chars[-1], _code_char_format())
+		for line in lines:
+			self._new_block(_code_block_format())
+			self._cursor.insertText(line, char_fmt)
+
+	def _render_table(self, tokens: list[Token], start: int) -> int:
+		"""Insert a table for tokens[start] (table_open); return the index of table_close."""
+		rows: list[list[Token]] = []
+		i = start + 1
+		while tokens[i].type != "table_close":
+			if tokens[i].type == "tr_open":
+				rows.append([])
+			elif tokens[i].type == "inline":
+				rows[-1].append(tokens[i])
+			i += 1
+
+		columns = max((len(row) for row in rows), default=0)
+		if not rows or not columns:
+			return i
+
+		self._new_block(_paragraph_block_format(True))
+		table = self._cursor.insertTable(len(rows), columns, _table_format())
+		outer_cursor = self._cursor
+		bold = _inline_char_format("strong_open")
+		for r, row in enumerate(rows):
+			if r == 0:
+				self._chars.append(_merged(self._chars[-1], bold))
+			for c, inline in enumerate(row):
+				self._cursor = table.cellAt(r, c).firstCursorPosition()
+				self._render_inline(inline.children or [])
+			if r == 0:
+				self._chars.pop()
+
+		self._cursor = outer_cursor
+		self._cursor.movePosition(QTextCursor.MoveOperation.End)
+		# Qt leaves an empty block after the table; the next element fills it
+		self._reuse_block = True
+		return i
+
+	def _list_format(self, token: Token) -> QTextListFormat:
+		fmt = QTextListFormat()
+		fmt.setIndent(self._quote_depth + len(self._lists) + 1)
+		if token.type == "ordered_list_open":
+			fmt.setStyle(QTextListFormat.Style.ListDecimal)
+			fmt.setStart(int(token.attrGet("start") or 1))
+		else:
+			fmt.setStyle(_BULLET_STYLES[len(self._lists) % len(_BULLET_STYLES)])
+		return fmt
+
+	def _new_block(self, block_fmt: QTextBlockFormat) -> None:
+		fmt = QTextBlockFormat(block_fmt)
+		if not self._pending_item:
+			fmt.setIndent(self._quote_depth + len(self._lists))
+
+		if self._reuse_block:
+			self._cursor.setBlockFormat(fmt)
+			self._cursor.setBlockCharFormat(self._chars[-1])
+			self._reuse_block = False
+		else:
+			self._cursor.insertBlock(fmt, self._chars[-1])
+
+		if self._pending_item:
+			text_list = self._text_lists[-1]
+			if text_list is None:
+				self._text_lists[-1] = self._cursor.createList(self._lists[-1])
+			else:
+				text_list.add(self._cursor.block())
+			self._pending_item = False
+
+
+def build_document(text: str, document: QTextDocument | None = None) -> QTextDocument:
+	"""Render markdown text straight into a QTextDocument (cleared first if given).
+
+	This always parses with markdown-it, whichever loader backend is active.
+	"""
+	if document is None:
+		document = QTextDocument()
+	return DocumentBuilder(document).build(md.parse(text))
+
+
+def _normalized_lines(document: QTextDocument) -> list[str]:
+	return [" ".join(line.split()) for line in document.toPlainText().splitlines() if line.strip()]
+
+
+def documents_match(first: QTextDocument, second: QTextDocument) -> bool:
+	"""Check that two documents have the same visible text, ignoring blank lines and spacing."""
+	return _normalized_lines(first) == _normalized_lines(second)
@@ -1,18 +1,304 @@
 from __future__ import annotations
 
+import html
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from html.parser import HTMLParser
 from pathlib import Path
+from typing import Protocol
 
 from markdown_it import MarkdownIt
 
+try:
+	import cmarkgfm
+	from cmarkgfm.cmark import Options as CmarkOptions
+except ImportError:  # Optional compiled backend
+	cmarkgfm = None
+
 md = MarkdownIt("commonmark", {"html": False}).enable("table").enable("strikethrough")
 
 
+@dataclass
+class Heading:
+	level: int
+	text: str
+	line: int  # Zero-based source line of the heading
+
+
+class MarkdownBackend(Protocol):
+	"""A Markdown parser able to provide everything mdvupy needs from a document."""
+
+	name: str
+
+	def render(self, text: str) -> str:
+		"""Render markdown text to an HTML body fragment."""
+		...
+
+	def headings(self, text: str) -> list[Heading]:
+		"""Extract headings in document order, with their raw inline source text."""
+		...
+
+	def links(self, text: str) -> list[str]:
+		"""Extract link targets (href values) in document order."""
+		...
+
+	def source_map(self, text: str) -> list[tuple[int, int]]:
+		"""Return zero-based [start, end) source line ranges of the top-level blocks.
+
+		Trailing blank lines are not part of a block. Link reference definitions
+		produce no block of their own.
+		"""
+		...
+
+
+def _trim_blank_lines(lines: list[str], start: int, end: int) -> tuple[int, int]:
+	"""Drop trailing blank lines from a block range so backends agree on block ends."""
+	while end > start + 1 and end - 1 < len(lines) and not lines[end - 1].strip():
+		end -= 1
+	return (start, end)
+
+
+class MarkdownItBackend:
+	"""Pure-Python markdown-it-py backend (always available, the reference implementation)."""
+
+	name = "markdown-it"
+
+	def render(self, text: str) -> str:
+		return md.render(text)
+
+	def headings(self, text: str) -> list[Heading]:
+		tokens = md.parse(text)
+		headings: list[Heading] = []
+		for i, token in enumerate(tokens):
+			if token.type == "heading_open" and i + 1 < len(tokens) and tokens[i + 1].type == "inline":
+				line = token.map[0] if token.map else 0
+				headings.append(Heading(level=int(token.tag[1]), text=tokens[i + 1].content, line=line))
+		return headings
+
+	def links(self, text: str) -> list[str]:
+		return [
+			str(child.attrGet("href"))
+			for token in md.parse(text)
+			if token.type == "inline"
+			for child in token.children or []
+			if child.type == "link_open"
+		]
+
+	def source_map(self, text: str) -> list[tuple[int, int]]:
+		lines = text.splitlines()
+		return [
+			_trim_blank_lines(lines, token.map[0], token.map[1])
+			for token in md.parse(text)
+			if token.level == 0 and token.nesting >= 0 and token.map
+		]
+
+
+_SOURCEPOS = r'data-sourcepos="(\d+):(\d+)-(\d+):(\d+)"'
+_HEADING_RE = re.compile(r"<h([1-6]) " + _SOURCEPOS)
+_LINK_RE = re.compile(r'<a href="([^"]*)"')
+_ATX_OPEN_RE = re.compile(r"^#{1,6}(?:[ \t]+|$)")
+_ATX_CLOSE_RE = re.compile(r"(?:^|[ \t]+)#+[ \t]*$")
+_SETEXT_UNDERLINE_RE = re.compile(r"^[ \t]*(?:=+|-+)[ \t]*$")
+_REFERENCE_DEFINITION_RE = re.compile(r"^ {0,3}\[(?:[^\]\\]|\\.)+\]:[ \t]*\S")
+# cmark drops raw HTML (markdown-it with html=False shows it as text) and empties unsafe URLs
+# such as javascript: (markdown-it leaves those links as text); such documents use markdown-it
+_RAW_HTML_OMITTED = "<!-- raw HTML omitted -->"
+_UNSAFE_URL_MARKERS = ('href=""', 'src=""')
+# Differences in cmark's HTML that Qt renders identically to markdown-it's
+_TABLE_ALIGN_RE = re.compile(r'<t([hd]) align="(left|center|right)">')
+# markdown-it renders code blocks straight after a tight list item's text, without a newline
+_NEWLINE_BEFORE_PRE_RE = re.compile(r"(?<=[^>\n])\n(?=<pre[ >])")
+_CMARK_EXTENSIONS = ["table", "strikethrough"]
+
+
+@lru_cache(maxsize=4)
+def _cmark_html(text: str, sourcepos: bool = False) -> str:
+	"""Render with cmark-gfm; cached so render/headings/links on one document parse it once per mode."""
+	# Like markdown-it, only ~~double~~ tildes strike through
+	options = CmarkOptions.CMARK_OPT_STRIKETHROUGH_DOUBLE_TILDE
+	if sourcepos:
+		options |= CmarkOptions.CMARK_OPT_SOURCEPOS
+	return cmarkgfm.markdown_to_html_with_extensions(text, options=options, extensions=_CMARK_EXTENSIONS)
+
+
+def _needs_fallback(body: str) -> bool:
+	return _RAW_HTML_OMITTED in body or any(marker in body for marker in _UNSAFE_URL_MARKERS)
+
+
+def _sourcepos_range(start_line: str, end_line: str, end_column: str) -> tuple[int, int]:
+	"""Convert a cmark 1-based inclusive sourcepos into a zero-based [start, end) line range."""
+	end = int(end_line)
+	if end_column == "0":
+		# cmark reports "line:0" when a block ends at the end of the previous line
+		end -= 1
+	return (int(start_line) - 1, max(end, int(start_line)))
+
+
+class _TopLevelBlocks(HTMLParser):
+	"""Collect the sourcepos attribute of every top-level element in cmark HTML output."""
+
+	def __init__(self) -> None:
+		super().__init__()
+		self._depth = 0
+		self.positions: list[tuple[str, str]] = []  # (tag, sourcepos)
+
+	def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+		if self._depth == 0:
+			self._record(tag, attrs)
+		self._depth += 1
+
+	def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+		if self._depth == 0:
+			self._record(tag, attrs)
+
+	def handle_endtag(self, tag: str) -> None:
+		self._depth -= 1
+
+	def _record(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+		sourcepos = dict(attrs).get("data-sourcepos")
+		if sourcepos:
+			self.positions.append((tag, sourcepos))
+
+
+class CmarkGfmBackend:
+	"""Compiled backend built on GitHub's cmark-gfm (requires the optional cmarkgfm package).
+
+	cmarkgfm only exposes HTML output, so headings and block positions are read
+	back from the data-sourcepos attributes and sliced out of the source text.
+	Documents whose output cmark cannot make match markdown-it (raw HTML, unsafe
+	URLs, headings with lazy continuation lines) are handed to markdown-it
+	instead. Such documents cost one cmark pass on top of the markdown-it parse,
+	so they are slightly slower than with markdown-it alone.
+	"""
+
+	name = "cmark-gfm"
+
+	def __init__(self) -> None:
+		self._fallback = MarkdownItBackend()
+
+	def render(self, text: str) -> str:
+		body = _cmark_html(text)
+		if _needs_fallback(body):
+			return self._fallback.render(text)
+		# Raw HTML never reaches the output, so every <del> comes from strikethrough
+		body = body.replace("<del>", "<s>").replace("</del>", "</s>")
+		body = _TABLE_ALIGN_RE.sub(r'<t\1 style="text-align:\2">', body)
+		return _NEWLINE_BEFORE_PRE_RE.sub("", body)
+
+	def _render_with_sourcepos(self, text: str) -> str:
+		return _cmark_html(text, sourcepos=True)
+
+	def headings(self, text: str) -> list[Heading]:
+		lines = text.splitlines()
+		headings: list[Heading] = []
+		for match in _HEADING_RE.finditer(self._render_with_sourcepos(text)):
+			level, start_line, start_column, end_line, end_column = match.groups()
+			start, end = _sourcepos_range(start_line, end_line, end_column)
+			# Columns are 1-based byte offsets; the first column marks any container prefix
+			column = int(start_column) - 1
+			encoded = [line.encode("utf-8") for line in lines[start:end]]
+			prefix = encoded[0][:column] if encoded else b""
+			if any(line[:column] != prefix and line[:column].strip() for line in encoded[1:]):
+				# A lazy continuation line has no container prefix to cut; let markdown-it handle it
+				return self._fallback.headings(text)
+			source = [line[column:].decode("utf-8", "ignore") for line in encoded]
+			if source and _ATX_OPEN_RE.match(source[0].lstrip()):
+				content = _ATX_CLOSE_RE.sub("", _ATX_OPEN_RE.sub("", source[0].lstrip()))
+			else:
+				if source and _SETEXT_UNDERLINE_RE.match(source[-1]):
+					source = source[:-1]
+				content = "\n".join(line.strip() for line in source)
+			headings.append(Heading(level=int(level), text=content.strip(), line=start))
+		return headings
+
+	def links(self, text: str) -> list[str]:
+		body = _cmark_html(text)
+		if _needs_fallback(body):
+			return self._fallback.links(text)
+		return [html.unescape(href) for href in _LINK_RE.findall(body)]
+
+	def source_map(self, text: str) -> list[tuple[int, int]]:
+		body = self._render_with_sourcepos(text)
+		if _RAW_HTML_OMITTED in body:
+			# Omitted HTML blocks carry no sourcepos; markdown-it maps them as paragraphs
+			return self._fallback.source_map(text)
+
+		lines = text.splitlines()
+		parser = _TopLevelBlocks()
+		parser.feed(body)
+		parser.close()
+		ranges: list[tuple[int, int]] = []
+		for tag, sourcepos in parser.positions:
+			start_pos, end_pos = sourcepos.split("-")
+			start_line, _ = start_pos.split(":")
+			end_line, end_column = end_pos.split(":")
+			start, end = _sourcepos_range(start_line, end_line, end_column)
+			if tag == "p":
+				# cmark's paragraph range still covers reference definitions it consumed
+				while start < end - 1 and _REFERENCE_DEFINITION_RE.match(lines[start]):
+					start += 1
+			ranges.append(_trim_blank_lines(lines, start, end))
+		return ranges
+
+
+def available_backends() -> dict[str, MarkdownBackend]:
+	"""Return the installed backends, fastest-preferred first."""
+	backends: dict[str, MarkdownBackend] = {}
+	if cmarkgfm is not None:
+		backends[CmarkGfmBackend.name] = CmarkGfmBackend()
+	backends[MarkdownItBackend.name] = MarkdownItBackend()
+	return backends
+
+
+# markdown-it is the reference; a faster backend is only used once `python -m mdvupy.benchmark` picks it
+_backend: MarkdownBackend = MarkdownItBackend()
+
+
+def get_backend() -> MarkdownBackend:
+	return _backend
+
+
+def set_backend(name: str) -> None:
+	"""Select the backend used by render_markdown_to_html and TOC extraction."""
+	global _backend
+	backends = available_backends()
+	if name not in backends:
+		raise ValueError(f"Unknown or unavailable Markdown backend: {name}")
+	_backend = backends[name]
+
+
+def backend_mismatches(text: str) -> list[tuple[str, str]]:
+	"""Compare every available backend against markdown-it.
+
+	Returns (backend name, aspect) pairs, where aspect is one of "toc",
+	"links", "render" or "source map".
+	"""
+	reference = MarkdownItBackend()
+	expected = {
+		"toc": reference.headings(text),
+		"links": reference.links(text),
+		"render": reference.render(text),
+		"source map": reference.source_map(text),
+	}
+	mismatches: list[tuple[str, str]] = []
+	for name, backend in available_backends().items():
+		actual = {
+			"toc": backend.headings(text),
+			"links": backend.links(text),
+			"render": backend.render(text),
+			"source map": backend.source_map(text),
+		}
+		mismatches.extend((name, aspect) for aspect in expected if actual[aspect] != expected[aspect])
+	return mismatches
+
+
 def load_markdown_file(path: Path) -> str:
 		return path.read_text(encoding="utf-8")
 
 
-def render_markdown_to_html(text: str) -> str:
-		body = md.render(text)
+def render_markdown_to_html(text: str, backend: MarkdownBackend | None = None) -> str:
+		body = (backend or _backend).render(text)
 		return f"""
 <!DOCTYPE html>
 <html>
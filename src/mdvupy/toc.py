@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from markdown_it import MarkdownIt
+
+from .loader import get_backend
 
 
 @dataclass
@@ -11,29 +12,19 @@ class TOCItem:
     anchor: str
 
 
+def make_anchor(text: str) -> str:
+    """Generate an anchor ID (simple slug) from heading text."""
+    anchor = text.lower().replace(" ", "-").replace("'", "")
+    # Remove special characters except hyphens
+    return "".join(c for c in anchor if c.isalnum() or c == "-")
+
+
 def extract_toc(text: str) -> list[TOCItem]:
     """Extract table of contents from markdown text.
     
-    Parses headings and generates anchor IDs for navigation.
+    Headings come from the active loader backend; anchor IDs are generated for navigation.
     """
-    md = MarkdownIt("commonmark")
-    tokens = md.parse(text)
-    
-    toc_items: list[TOCItem] = []
-    
-    for i, token in enumerate(tokens):
-        if token.type == "heading_open":
-            level = int(token.tag[1])  # h1 -> 1, h2 -> 2, etc.
-            
-            # Get the text content from the next token
-            if i + 1 < len(tokens) and tokens[i + 1].type == "inline":
-                heading_text = tokens[i + 1].content
-                
-                # Generate anchor from heading text (simple slug)
-                anchor = heading_text.lower().replace(" ", "-").replace("'", "")
-                # Remove special characters except hyphens
-                anchor = "".join(c for c in anchor if c.isalnum() or c == "-")
-                
-                toc_items.append(TOCItem(level=level, text=heading_text, anchor=anchor))
-    
-    return toc_items
+    return [
+        TOCItem(level=heading.level, text=heading.text, anchor=make_anchor(heading.text))
+        for heading in get_backend().headings(text)
+    ]
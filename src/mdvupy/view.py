@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+from enum import Enum
 from pathlib import Path
 
+from loguru import logger
 from PySide6.QtCore import QUrl, Signal
+from PySide6.QtGui import QTextCursor, QTextDocument
 from PySide6.QtWidgets import QTextBrowser
 
+from .document import build_document, documents_match
 from .links import LinkType, classify_link
-from .loader import render_markdown_to_html
+from .loader import MarkdownItBackend, get_backend, render_markdown_to_html
+
+
+class RenderMode(Enum):
+	HTML = "html"  # Render to an HTML string and let Qt parse it with setHtml
+	DOCUMENT = "document"  # Build the QTextDocument directly from markdown-it tokens (ignores the loader backend)
 
 
 class MarkdownView(QTextBrowser):
@@ -19,14 +28,42 @@ class MarkdownView(QTextBrowser):
 		self.setOpenExternalLinks(False)
 		self.setOpenLinks(False)
 		self._base_path: Path | None = None
+		self._render_mode = RenderMode.HTML
+		self._html_margin = self.document().documentMargin()  # DOCUMENT mode sets its own margin
+		self.verify_parity = False  # Compare DOCUMENT output against the HTML renderer
 		
 		# Connect the anchorClicked signal to our handler
 		self.anchorClicked.connect(self._handle_link_click)
 
 	def set_markdown(self, text: str, base_path: Path | None = None) -> None:
 		self._base_path = base_path
-		html = render_markdown_to_html(text)
-		self.setHtml(html)
+		if self._render_mode is RenderMode.DOCUMENT:
+			build_document(text, self.document())
+			self.moveCursor(QTextCursor.MoveOperation.Start)
+			if self.verify_parity:
+				self._check_parity(text)
+		else:
+			self.document().setDocumentMargin(self._html_margin)
+			html = render_markdown_to_html(text)
+			self.setHtml(html)
+
+	@property
+	def render_mode(self) -> RenderMode:
+		return self._render_mode
+
+	def set_render_mode(self, mode: RenderMode) -> None:
+		"""Select the renderer used by subsequent set_markdown calls."""
+		self._render_mode = mode
+		backend = get_backend()
+		if mode is RenderMode.DOCUMENT and backend.name != MarkdownItBackend.name:
+			logger.info(f"Direct rendering always parses with markdown-it; the {backend.name} backend is not used")
+
+	def _check_parity(self, text: str) -> None:
+		"""Log a warning if the direct renderer's text differs from markdown-it's HTML rendering."""
+		reference = QTextDocument()
+		reference.setHtml(render_markdown_to_html(text, MarkdownItBackend()))
+		if not documents_match(self.document(), reference):
+			logger.warning("Direct document rendering differs from HTML rendering")
 
 	def set_base_path(self, path: Path | None) -> None:
 		self._base_path = path
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import pytest
+
+from mdvupy.loader import MarkdownItBackend, available_backends, backend_mismatches
+from mdvupy.toc import make_anchor
+
+SAMPLES = {
+	"nested": """# Nested
+
+> quote
+> > ## Deeper *heading* ##
+> > - item [one](one.md)
+>
+> back out
+
+- a
+  - b [two](#two)
+    1. c
+       > ### In a list
+- d
+""",
+	"setext": """Title
+=====
+
+Multi line
+setext heading
+--------------
+
+Text with [link](https://example.com "title").
+""",
+	"lazy": """> foo
+bar
+> ===
+
+- item
+  continued
+  ---
+
+> - nested
+>   heading
+>   -------
+""",
+	"aligned": """| a | b | c |
+|:--|:-:|--:|
+| 1 | 2 | 3 |
+
+- Reset the database:
+  ```bash
+  lsregister -kill
+  ```
+- > quoted
+""",
+	"crlf": "# Windows\r\n\r\nLine one\r\nline two [x](x.md)\r\n\r\n## Second ##\r\n",
+	"references": """# References
+
+[a][r] and [b] and [Full][r].
+
+[r]: /u%20v "title"
+[b]: <a b.md>
+[b](<a b>) after definitions
+""",
+	"mixed": """## Table
+
+| h1 | h2 |
+|----|----|
+| [a](a.md) | `b` |
+
+```python
+# not a heading
+```
+
+~one~ ~~two~~ <https://auto.example> [é](ü.md#x)
+""",
+	"unsafe": """# Unsafe
+
+<div>raw block</div>
+
+Inline <b>html</b> and [x](javascript:alert(1)).
+""",
+}
+
+
+@pytest.fixture(params=list(available_backends()))
+def backend(request):
+	return available_backends()[request.param]
+
+
+@pytest.mark.parametrize("name", list(SAMPLES))
+def test_backend_toc_matches_markdown_it(backend, name):
+	text = SAMPLES[name]
+	expected = MarkdownItBackend().headings(text)
+	actual = backend.headings(text)
+	assert actual == expected
+	assert [make_anchor(h.text) for h in actual] == [make_anchor(h.text) for h in expected]
+
+
+@pytest.mark.parametrize("name", list(SAMPLES))
+def test_backend_links_match_markdown_it(backend, name):
+	text = SAMPLES[name]
+	assert backend.links(text) == MarkdownItBackend().links(text)
+
+
+@pytest.mark.parametrize("name", list(SAMPLES))
+def test_backend_render_and_source_map_match_markdown_it(backend, name):
+	text = SAMPLES[name]
+	reference = MarkdownItBackend()
+	assert backend.render(text) == reference.render(text)
+	assert backend.source_map(text) == reference.source_map(text)
+
+
+@pytest.mark.parametrize("name", list(SAMPLES))
+def test_backend_mismatches_empty(name):
+	assert backend_mismatches(SAMPLES[name]) == []
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import pytest
+from PySide6.QtGui import QTextDocument
+
+from mdvupy.document import build_document, documents_match
+from mdvupy.loader import MarkdownItBackend, render_markdown_to_html
+from mdvupy.toc import extract_toc
+from mdvupy.view import MarkdownView, RenderMode
+
+SAMPLES = {
+	"lists": """# Lists
+
+- a
+- b
+  - nested
+- c
+
+1. one
+
+   more para
+2. two
+""",
+	"table": """## Table
+
+| h1 | h2 |
+|----|----|
+| a  | **b** |
+| [c](c.md) | `d` |
+
+After the table.
+""",
+	"quotes": """> quote
+> > deeper
+>
+> - in a quote
+""",
+	"code": """Some `inline` code.
+
+```python
+def f():
+    return 1
+```
+
+    indented code
+
+---
+""",
+	"links": """# Links and *Emphasis*
+
+Text with [external](https://example.com "t"), [local](other.md), [anchor](#links-and-emphasis)
+and ~~struck~~ text.
+Hard  
+break ![image](pic.png)
+""",
+}
+
+
+def _html_document(text: str) -> QTextDocument:
+	document = QTextDocument()
+	document.setHtml(render_markdown_to_html(text, MarkdownItBackend()))
+	return document
+
+
+def _fragment_formats(document: QTextDocument):
+	block = document.begin()
+	while block.isValid():
+		iterator = block.begin()
+		while not iterator.atEnd():
+			fragment = iterator.fragment()
+			if fragment.isValid():
+				yield fragment.charFormat()
+			iterator += 1
+		block = block.next()
+
+
+@pytest.mark.parametrize("name", list(SAMPLES))
+def test_direct_document_matches_html(qapp, name):
+	text = SAMPLES[name]
+	assert documents_match(build_document(text), _html_document(text))
+
+
+@pytest.mark.parametrize("name", list(SAMPLES))
+def test_headings_carry_toc_anchor_names(qapp, name):
+	text = SAMPLES[name]
+	anchor_names = [
+		anchor for fmt in _fragment_formats(build_document(text)) for anchor in fmt.anchorNames()
+	]
+	assert list(dict.fromkeys(anchor_names)) == [item.anchor for item in extract_toc(text)]
+
+
+def test_link_hrefs_preserved(qapp):
+	text = SAMPLES["links"] + SAMPLES["table"]
+	hrefs: list[str] = []
+	for fmt in _fragment_formats(build_document(text)):
+		href = fmt.anchorHref()
+		if href and (not hrefs or hrefs[-1] != href):
+			hrefs.append(href)
+	assert hrefs == MarkdownItBackend().links(text)
+
+
+def test_html_mode_restores_document_margin(qtbot):
+	view = MarkdownView()
+	qtbot.addWidget(view)
+	default_margin = view.document().documentMargin()
+
+	view.set_render_mode(RenderMode.DOCUMENT)
+	view.set_markdown(SAMPLES["lists"])
+	assert view.document().documentMargin() != default_margin
+
+	view.set_render_mode(RenderMode.HTML)
+	view.set_markdown(SAMPLES["lists"])
+	assert view.document().documentMargin() == default_margin